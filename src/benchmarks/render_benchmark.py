@@ -0,0 +1,102 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, List
+
+from configs.config import Config
+from configs.constants import FRAGMENT_CACHE_SIZE
+from lib.http_cache import catalog_version
+from lib.rendering import TemplateRenderer
+
+PER_PAGE: int = 10
+
+
+def build_stations(total: int) -> List[SimpleNamespace]:
+    genres: List[str] = ["pop", "rock", "jazz, blues", "house, techno", "classical"]
+    return [
+        SimpleNamespace(
+            id=i,
+            name=f"Station {i}",
+            slug=f"station-{i}",
+            genre=genres[i % len(genres)],
+            country_code="DE",
+            country=SimpleNamespace(code="DE", name="Germany"),
+            is_favorite=i % 7 == 0,
+        )
+        for i in range(total)
+    ]
+
+
+def timed(fn: Callable[[], object], iterations: int) -> float:
+    start: float = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def render_page(renderer: TemplateRenderer, stations: List[SimpleNamespace], countries: List, genres: List[str],
+                page: int, use_fragments: bool) -> str:
+    if not use_fragments:
+        renderer.fragments.clear()
+
+    station_grid = renderer.fragments.get(("stations", page), catalog_version.version)
+    if station_grid is None:
+        page_stations = stations[(page - 1) * PER_PAGE:page * PER_PAGE]
+        station_grid = renderer.render_fragment("partials/station_grid.html", stations=page_stations)
+        renderer.fragments.set(("stations", page), station_grid, catalog_version.version)
+
+    genre_options = renderer.fragments.get("genre_options", catalog_version.ingest_version)
+    if genre_options is None:
+        genre_options = renderer.render_fragment("partials/genre_options.html", genres=genres)
+        renderer.fragments.set("genre_options", genre_options, catalog_version.ingest_version)
+
+    country_options = renderer.fragments.get("country_options", catalog_version.ingest_version)
+    if country_options is None:
+        country_options = renderer.render_fragment("partials/country_options.html", countries=countries)
+        renderer.fragments.set("country_options", country_options, catalog_version.ingest_version)
+
+    return renderer.env.get_template("index.html").render(
+        station_grid=station_grid,
+        genre_options=genre_options,
+        country_options=country_options,
+        page=page,
+        total_pages=(len(stations) + PER_PAGE - 1) // PER_PAGE,
+    )
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Benchmark station list rendering.")
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=200)
+    args: argparse.Namespace = parser.parse_args()
+
+    configs: Config = Config()
+    stations: List[SimpleNamespace] = build_stations(args.pages * PER_PAGE)
+    countries: List[SimpleNamespace] = [
+        SimpleNamespace(code=f"{chr(65 + i // 26)}{chr(65 + i % 26)}", name=f"Country {i}") for i in range(250)
+    ]
+    genres: List[str] = sorted({g.strip() for s in stations for g in s.genre.split(",")})
+
+    with tempfile.TemporaryDirectory() as bytecode_dir:
+        start: float = time.perf_counter()
+        cold: TemplateRenderer = TemplateRenderer(configs.templates_path, Path(bytecode_dir), FRAGMENT_CACHE_SIZE)
+        cold.env.get_template("index.html")
+        cold_load: float = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        warm: TemplateRenderer = TemplateRenderer(configs.templates_path, Path(bytecode_dir), FRAGMENT_CACHE_SIZE)
+        warm.env.get_template("index.html")
+        warm_load: float = (time.perf_counter() - start) * 1000
+
+        print(f"index.html load: {cold_load:.2f} ms compiled, {warm_load:.2f} ms from bytecode cache")
+        print(f"{'page':>6} | {'full render (ms)':>17} | {'fragment cached (ms)':>21}")
+        for page in range(1, args.pages + 1):
+            full: float = timed(lambda: render_page(warm, stations, countries, genres, page, False), args.iterations)
+            cached: float = timed(lambda: render_page(warm, stations, countries, genres, page, True), args.iterations)
+            print(f"{page:>6} | {full:>17.3f} | {cached:>21.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
+import os
 from pathlib import Path
 
 class Config:
     def __init__(self):
         self.database_path: Path = Path(__file__).resolve().parents[2] / "database" / "stations.db"
+        self.catalog_version_path: Path = Path(__file__).resolve().parents[2] / "database" / "catalog.version"
         self.station_api_url: str = "https://de1.api.radio-browser.info/json/stations"
+        self.templates_path: Path = Path(__file__).resolve().parents[1] / "templates"
+        self.template_cache_path: Path = Path(__file__).resolve().parents[2] / ".jinja_cache"
+        self.populate_on_startup: bool = os.environ.get("POPULATE_ON_STARTUP", "1") == "1"
+        self.profile_startup: bool = os.environ.get("PROFILE_STARTUP", "0") == "1"
         
\ No newline at end of file
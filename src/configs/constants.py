@@ -56,4 +56,16 @@ GENRE_SYNONYMS: Dict[str, Iterable[str]] = {
     "00s": ["00s", "2000s"],
     "world": ["world", "world music", "global"],
     "chill": ["chill", "chillout", "chill out"],
-}
\ No newline at end of file
+}
+
+CACHE_CONTROL: str = "public, max-age=0, must-revalidate"
+
+GZIP_MINIMUM_SIZE: int = 1000
+
+FRAGMENT_CACHE_SIZE: int = 512
+
+SONGS_PER_PAGE: int = 48
+
+SONGS_IMPORT_BATCH_SIZE: int = 500
+
+SONGS_EXPORT_BATCH_SIZE: int = 1000
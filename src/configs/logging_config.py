@@ -2,7 +2,7 @@ from typing import Dict, Any
 
 LOGGING_CONFIG: Dict[str, Any] = { 
     'version': 1,
-    'disable_existing_loggers': True,
+    'disable_existing_loggers': False,
     'formatters': { 
         'standard': { 
             'format': '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncEngine
 )
+from sqlalchemy import Connection
 from sqlalchemy.orm import DeclarativeBase
 
 class Base(DeclarativeBase):
@@ -67,11 +68,18 @@ class Database:
         try:
             async with self._engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
+                await conn.run_sync(self._create_missing_indexes)
             self.logger.info("Tables created successfully.")
         except Exception as e:
             self.logger.exception("Error while creating tables.")
             raise
     
+    def _create_missing_indexes(self, conn: Connection) -> None:
+        # create_all skips indexes on tables that already exist.
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
     async def dispose(self) -> None:
         self.logger.info("Disposing database engine ...")
         try:
@@ -1,7 +1,8 @@
-from typing import Optional
+from typing import Optional, List, Iterable, AsyncGenerator, Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession, AsyncResult
-from sqlalchemy import select
+from sqlalchemy import select, or_, Row
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.exc import IntegrityError
 
 from lib.models import Station, Song
@@ -18,7 +19,7 @@ async def create_station(
     db_station: Station = Station(
         name=station.name,
         genre=station.genre,
-        url=station.url,
+        url=str(station.url),
         country_code=station.country_code,
         is_favorite=getattr(station, 'is_favorite', False),
         slug=slug
@@ -37,6 +38,12 @@ async def get_station(db: AsyncSession, station_slug: str) -> Optional[Station]:
     result: AsyncResult = await db.execute(select(Station).filter(Station.slug==station_slug))
     return result.scalars().first()
 
+async def list_genres(db: AsyncSession) -> List[str]:
+    result: AsyncResult = await db.execute(select(Station.genre).where(Station.genre.is_not(None)).distinct())
+    return sorted(
+        {genre.strip() for row in result.scalars().all() for genre in row.split(",") if genre.strip()}
+    )
+
 async def create_song(db: AsyncSession, name: str) -> Optional[Song]:
     result: AsyncResult = await db.execute(select(Song).filter(Song.name==name))
     existing_song: Optional[Song] = result.scalars().first()
@@ -53,3 +60,34 @@ async def create_song(db: AsyncSession, name: str) -> Optional[Song]:
         return None
     return song
 
+async def list_songs(
+        db: AsyncSession, limit: int, after: Optional[str] = None, prefix: Optional[str] = None) -> List[Song]:
+    name_nocase = Song.name.collate("NOCASE")
+    stmt = select(Song).order_by(name_nocase, Song.name).limit(limit)
+    if after:
+        # Written as a range plus tiebreak (not a row value) so SQLite seeks the index.
+        stmt = stmt.where(name_nocase >= after, or_(name_nocase > after, Song.name > after))
+    if prefix:
+        stmt = stmt.where(name_nocase >= prefix, name_nocase < prefix + "\U0010ffff")
+    result: AsyncResult = await db.execute(stmt)
+    return result.scalars().all()
+
+async def upsert_songs(db: AsyncSession, names: Iterable[str], batch_size: int) -> int:
+    unique_names: List[str] = list(dict.fromkeys(name.strip() for name in names if name.strip()))
+    inserted: int = 0
+    for start in range(0, len(unique_names), batch_size):
+        batch: List[str] = unique_names[start:start + batch_size]
+        stmt = insert(Song).values([{"name": name} for name in batch]).on_conflict_do_nothing(
+            index_elements=[Song.name]
+        ).returning(Song.id)
+        result: AsyncResult = await db.execute(stmt)
+        inserted += len(result.scalars().all())
+    await db.commit()
+    return inserted
+
+async def stream_songs(db: AsyncSession, batch_size: int) -> AsyncGenerator[Sequence[Row], None]:
+    result: AsyncResult = await db.stream(
+        select(Song.id, Song.name).order_by(Song.name).execution_options(yield_per=batch_size)
+    )
+    async for partition in result.partitions():
+        yield partition
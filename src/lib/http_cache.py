@@ -0,0 +1,127 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request
+
+from configs.config import Config
+from configs.constants import CACHE_CONTROL
+
+
+class CatalogVersion:
+    """Version of the station/country catalog shared by all worker processes.
+
+    The version is an opaque token kept in a small file next to the database and
+    replaced whenever the catalog changes (ingest, favorite toggles), so that
+    validators can be answered without querying the database. A separate ingest
+    version only changes when stations or countries are added. Each process
+    re-reads the file only when ``os.stat`` reports that it changed.
+    """
+
+    def __init__(self, path: Path):
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        self._path: Path = path
+        self._stat_key: Optional[Tuple[int, int, int]] = None
+        self._state: Dict[str, Any] = {}
+
+    @property
+    def version(self) -> str:
+        return self._read()["version"]
+
+    @property
+    def ingest_version(self) -> str:
+        return self._read()["ingest_version"]
+
+    @property
+    def last_modified(self) -> datetime:
+        return datetime.fromtimestamp(self._read()["last_modified"], tz=timezone.utc)
+
+    def bump(self, ingest: bool = False) -> str:
+        previous: Optional[Dict[str, Any]] = self._read() if self._path.exists() else None
+        # Last-Modified has one-second resolution, so always move it forward
+        # to keep If-Modified-Since from matching the previous catalog.
+        last_modified: int = int(time.time())
+        if previous is not None:
+            last_modified = max(last_modified, previous["last_modified"] + 1)
+
+        version: str = uuid.uuid4().hex
+        state: Dict[str, Any] = {
+            "version": version,
+            "ingest_version": version if ingest or previous is None else previous["ingest_version"],
+            "last_modified": last_modified,
+        }
+        self._write(state)
+        self.logger.info(f"Catalog version bumped to {state['version']}")
+        return state["version"]
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            stat: os.stat_result = os.stat(self._path)
+        except FileNotFoundError:
+            self.bump()
+            stat = os.stat(self._path)
+
+        stat_key: Tuple[int, int, int] = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stat_key != self._stat_key:
+            with open(self._path, "r") as f:
+                self._state = json.load(f)
+            self._state.setdefault("ingest_version", self._state["version"])
+            self._stat_key = stat_key
+        return self._state
+
+    def _write(self, state: Dict[str, Any]) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self._path.parent, prefix=self._path.name)
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self._path)
+
+
+catalog_version: CatalogVersion = CatalogVersion(Config().catalog_version_path)
+
+
+def build_etag(request: Request) -> str:
+    query: str = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    key: str = f"{catalog_version.version}:{request.url.path}?{query}"
+    # Weak: the tag tracks the catalog version, not the exact bytes, and the
+    # same tag is sent for gzip and identity encodings.
+    return 'W/"' + hashlib.sha1(key.encode()).hexdigest() + '"'
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(catalog_version.last_modified, usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+    }
+
+
+def _opaque_tag(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [_opaque_tag(tag) for tag in if_none_match.split(",")]
+        return "*" in candidates or _opaque_tag(etag) in candidates
+
+    if_modified_since: Optional[str] = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since: datetime = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return catalog_version.last_modified <= since
+    return False
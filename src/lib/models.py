@@ -1,6 +1,5 @@
-from sqlalchemy import Integer, String, ForeignKey, event, Boolean, text
+from sqlalchemy import Integer, String, ForeignKey, event, Boolean, text, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from slugify import slugify
 from typing import List, Optional
 
 from database.database import Base
@@ -39,7 +38,12 @@ class Song(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String, unique=True, nullable=False)
 
+# Case-insensitive prefix search and keyset pagination on the songs library.
+Index("ix_songs_name_nocase", Song.name.collate("NOCASE"), Song.name)
+
 @event.listens_for(Station, "before_insert")
 def generate_slug(mapper, connection, target: Station):
     if not target.slug and target.name:
+        from slugify import slugify
+
         target.slug = slugify(target.name)
\ No newline at end of file
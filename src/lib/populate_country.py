@@ -1,13 +1,14 @@
-import pycountry
 from sqlalchemy import select
 import logging
 from sqlalchemy.ext.asyncio import AsyncResult
-from typing import List, Optional
+from typing import Set
 
 
 
 from database.database import Database
 from lib.models import Country
+from lib.http_cache import catalog_version
+from configs.countries import COUNTRIES
 
 
 class PopulateCountryHandler:
@@ -20,24 +21,23 @@ class PopulateCountryHandler:
         await self.db_template.create_all()
 
         async with self.db_template.session() as db:
-            result: AsyncResult = await db.execute(select(Country))
-            countries: List[Country] = result.scalars().all()
+            result: AsyncResult = await db.execute(select(Country.code))
+            existing_codes: Set[str] = set(result.scalars().all())
 
-            if countries:
+            if existing_codes:
                 self.logger.info("Country table already populated. Skipping population.")
             
-            for country in pycountry.countries:
-                code: str = country.alpha_2
-                name: str = country.name
-
-                result: AsyncResult = await db.execute(select(Country).where(Country.code==code))
-                existing: Optional[Country] = result.scalar_one_or_none()
-                if existing:
+            added: int = 0
+            for code, name in COUNTRIES.items():
+                if code in existing_codes:
                     continue
 
                 new_country: Country = Country(code=code, name=name)
                 db.add(new_country)
+                added += 1
                 self.logger.info(f"Added: {name} - ({code})")
 
+        if added:
+            catalog_version.bump(ingest=True)
         self.logger.info("Country population completed.")
     
\ No newline at end of file
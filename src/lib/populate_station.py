@@ -13,6 +13,7 @@ from database.database import Database
 from configs.constants import GENRE_SYNONYMS, BRACKETS_RE, SEPARATORS_RE, GENERIC_WORDS, SPACES_RE
 from lib.schemas import StationCreate
 from lib.models import Station
+from lib.http_cache import catalog_version
 from sqlalchemy.exc import IntegrityError
 
 class StationHandler:
@@ -42,6 +43,7 @@ class StationHandler:
     from sqlalchemy.exc import IntegrityError
 
     async def _get_necessary_data(self, stations: list):
+        added: int = 0
         for station in stations:
             genre_text_parts: List[str] = []
             orginal_station_name: str = station.get("name", "")
@@ -98,6 +100,7 @@ class StationHandler:
                 try:
                     session.add(new_station)
                     await session.commit()  
+                    added += 1
                     self.logger.info(f"Added station: {normalized_name}")
                 except IntegrityError as e:
                     self.logger.warning(f"IntegrityError while adding station: {normalized_name} | Error: {e}")
@@ -108,6 +111,9 @@ class StationHandler:
                     await session.rollback()  
                     continue
 
+        if added:
+            catalog_version.bump(ingest=True)
+
     
     def _infer_genres_from_text(self, genre_text: str) -> str:
         if not genre_text:
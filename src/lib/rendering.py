@@ -0,0 +1,56 @@
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional, Tuple
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+
+
+class FragmentCache:
+    """Bounded LRU of rendered fragments, each tagged with the catalog version it was built from.
+
+    A lookup only hits when the caller's current version matches, so fragments
+    built before a concurrent bump are never served under the new version.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries: int = max_entries
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, version: str) -> Optional[Any]:
+        entry: Optional[Tuple[str, Any]] = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] != version:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, version: str) -> None:
+        self._entries[key] = (version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class TemplateRenderer:
+    def __init__(self, templates_path: Path, bytecode_cache_path: Path, max_fragments: int):
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        bytecode_cache_path.mkdir(parents=True, exist_ok=True)
+
+        self.env: Environment = Environment(
+            loader=FileSystemLoader(templates_path),
+            autoescape=select_autoescape(),
+            bytecode_cache=FileSystemBytecodeCache(str(bytecode_cache_path)),
+        )
+        self.templates: Jinja2Templates = Jinja2Templates(env=self.env)
+        self.fragments: FragmentCache = FragmentCache(max_fragments)
+
+    def render_fragment(self, template_name: str, **context: Any) -> Markup:
+        return Markup(self.env.get_template(template_name).render(**context))
@@ -1,4 +1,4 @@
-from typing import Optional, Annotated
+from typing import Optional, Annotated, List
 from pydantic import (
     BaseModel, ConfigDict, StringConstraints, HttpUrl
 )
@@ -49,3 +49,6 @@ class SongCreate(BaseModel):
 class SongRead(BaseModel):
     id: int
     name: NameStr
+
+class SongImport(BaseModel):
+    names: List[NameStr]
@@ -0,0 +1,40 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class StartupProfiler:
+    """Collects wall-clock durations of worker startup phases."""
+
+    def __init__(self):
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        self._started_at: float = time.perf_counter()
+        self._phases: Dict[str, float] = {}
+
+    @property
+    def phases(self) -> Dict[str, float]:
+        return dict(self._phases)
+
+    def record_since_start(self, name: str) -> None:
+        self._phases[name] = time.perf_counter() - self._started_at
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases[name] = time.perf_counter() - start
+
+    def report(self) -> str:
+        width: int = max((len(name) for name in self._phases), default=0)
+        return "\n".join(
+            f"{name.ljust(width)} {seconds * 1000:10.2f} ms" for name, seconds in self._phases.items()
+        )
+
+    def log_report(self) -> None:
+        self.logger.info("Startup profile:\n" + self.report())
+
+
+startup_profiler: StartupProfiler = StartupProfiler()
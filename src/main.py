@@ -1,27 +1,42 @@
+# Imported first so the "imports" phase timer starts before the heavy imports below.
+from lib.startup_profiler import startup_profiler
+import argparse
+import asyncio
 import logging
 import logging.config
-from typing import Optional, Tuple, List
-import os
+from typing import Optional, Tuple, List, AsyncGenerator
+import csv
 import io
 
-import requests
 from fastapi import FastAPI, Request, Query, Depends, HTTPException, status
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, RedirectResponse, ORJSONResponse, Response, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+import orjson
 from sqlalchemy import select, func, Select
 from sqlalchemy.ext.asyncio import AsyncSession, AsyncResult
+from markupsafe import Markup
 
 from database.database import Database
 from lib.models import Station, Country, Song
-from lib.schemas import StationCreate, StationRead
-from lib.crud import create_station, create_song
-from lib.populate_country import PopulateCountryHandler
-from lib.populate_station import StationHandler
+from lib.schemas import StationCreate, StationRead, SongImport
+from lib.crud import create_station, create_song, list_genres, list_songs, upsert_songs, stream_songs
+from lib.http_cache import catalog_version, build_etag, cache_headers, is_not_modified
+from lib.rendering import TemplateRenderer
 from configs.config import Config
+from configs.constants import (
+    GZIP_MINIMUM_SIZE, FRAGMENT_CACHE_SIZE, SONGS_PER_PAGE, SONGS_IMPORT_BATCH_SIZE, SONGS_EXPORT_BATCH_SIZE
+)
 from configs.logging_config import LOGGING_CONFIG
 
+startup_profiler.record_since_start("imports")
+
 app = FastAPI()
-templates = Jinja2Templates(directory=os.path.join(os.path.dirname(__file__), 'templates'))
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+configs: Config = Config()
+renderer: TemplateRenderer = TemplateRenderer(
+    configs.templates_path, configs.template_cache_path, FRAGMENT_CACHE_SIZE
+)
+templates = renderer.templates
 
 db_instance: Optional[Database] = None  
 
@@ -32,21 +47,48 @@ async def get_db() -> AsyncSession:
 @app.on_event("startup")
 async def startup_event():
     global db_instance
-    configs: Config = Config()
     logging.config.dictConfig(LOGGING_CONFIG)
     logger: logging.Logger = logging.getLogger(__name__)
 
-    db_instance = Database(configs.database_path)
-    await db_instance.create_all()
-
-    country_handler: PopulateCountryHandler = PopulateCountryHandler(db_instance)
-    await country_handler.populate_countries()
-
-    station_handler: StationHandler = StationHandler(
-        api_url=configs.station_api_url,
-        db_template=db_instance
-    )
-    await station_handler.run()
+    with startup_profiler.phase("database_init"):
+        db_instance = Database(configs.database_path)
+    with startup_profiler.phase("create_all"):
+        await db_instance.create_all()
+
+    if configs.populate_on_startup:
+        # Ingest-only dependencies (requests, slugify) are imported here so that
+        # serving workers started with POPULATE_ON_STARTUP=0 never load them.
+        from lib.populate_country import PopulateCountryHandler
+        from lib.populate_station import StationHandler
+
+        with startup_profiler.phase("populate_countries"):
+            country_handler: PopulateCountryHandler = PopulateCountryHandler(db_instance)
+            await country_handler.populate_countries()
+
+        with startup_profiler.phase("populate_stations"):
+            station_handler: StationHandler = StationHandler(
+                api_url=configs.station_api_url,
+                db_template=db_instance
+            )
+            await station_handler.run()
+    else:
+        logger.info("Skipping catalog population on startup.")
+
+    startup_profiler.record_since_start("total")
+    if configs.profile_startup:
+        startup_profiler.log_report()
+
+
+def filter_stations(
+    stmt: Select, q: Optional[str], genre: Optional[str], country: Optional[str]
+) -> Select:
+    if q:
+        stmt = stmt.filter(Station.name.ilike(f"%{q}%"))
+    if genre:
+        stmt = stmt.filter(Station.genre.ilike(f"%{genre}%"))
+    if country:
+        stmt = stmt.filter(Station.country_code == country)
+    return stmt
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -58,44 +100,124 @@ async def home(
     country: Optional[str] = None,
     q: Optional[str] = None,
 ):
-    per_page: int = 10
-    stmt: Select[Station] = select(Station)
-    if q:
-        stmt = stmt.filter(Station.name.ilike(f"%{q}%"))
-    if genre:
-        stmt = stmt.filter(Station.genre.ilike(f"%{genre}%"))
-    if country:
-        stmt = stmt.filter(Station.country_code == country)
-    
-    count_stmt: Select[Tuple[int]] = select(func.count()).select_from(stmt.subquery())
-    count_result: AsyncResult = await db.execute(count_stmt)
-    total_count: int = count_result.scalar_one()
+    etag: str = build_etag(request)
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
 
-    result: AsyncResult = await db.execute(stmt.offset((page - 1) * per_page).limit(per_page))
-    stations: List[Station] = result.scalars().all()
-
-    genres_result: AsyncResult = await db.execute(select(Station.genre).distinct())
-    genres: List[str] = [g[0] for g in genres_result.all() if g[0]]
-
-    countries_result: AsyncResult = await db.execute(select(Country).order_by(Country.name))
-    countries: List[Country] = countries_result.scalars().all()
+    per_page: int = 10
+    version: str = catalog_version.version
+    ingest_version: str = catalog_version.ingest_version
+    listing_key: Tuple = ("stations", page, q, genre, country)
+    listing: Optional[Tuple[Markup, int]] = renderer.fragments.get(listing_key, version)
+    if listing is None:
+        stmt: Select[Station] = filter_stations(select(Station), q, genre, country)
+
+        count_stmt: Select[Tuple[int]] = select(func.count()).select_from(stmt.subquery())
+        count_result: AsyncResult = await db.execute(count_stmt)
+        total_count: int = count_result.scalar_one()
+
+        result: AsyncResult = await db.execute(stmt.offset((page - 1) * per_page).limit(per_page))
+        stations: List[Station] = result.scalars().all()
+
+        listing = (
+            renderer.render_fragment("partials/station_grid.html", stations=stations),
+            (total_count + per_page - 1) // per_page,
+        )
+        renderer.fragments.set(listing_key, listing, version)
+    station_grid, total_pages = listing
+
+    genre_options: Optional[Markup] = renderer.fragments.get("genre_options", ingest_version)
+    if genre_options is None:
+        genres: List[str] = await list_genres(db)
+        genre_options = renderer.render_fragment("partials/genre_options.html", genres=genres)
+        renderer.fragments.set("genre_options", genre_options, ingest_version)
+
+    country_options: Optional[Markup] = renderer.fragments.get("country_options", ingest_version)
+    if country_options is None:
+        countries_result: AsyncResult = await db.execute(select(Country.code, Country.name).order_by(Country.name))
+        countries: List = countries_result.all()
+        country_options = renderer.render_fragment("partials/country_options.html", countries=countries)
+        renderer.fragments.set("country_options", country_options, ingest_version)
 
     return templates.TemplateResponse(
         "index.html",
         {
             "request": request,
-            "stations": stations,
-            "genres": genres,
-            "countries": countries,
+            "station_grid": station_grid,
+            "genre_options": genre_options,
+            "country_options": country_options,
             "selected_genre": genre,
             "selected_country": country,
             "selected_query": q,
             "page": page,
+            "total_pages": total_pages,
+        },
+        headers=cache_headers(etag),
+    )
+
+
+@app.get("/api/stations", response_class=ORJSONResponse)
+async def api_stations(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(50, ge=1, le=500),
+    genre: Optional[str] = None,
+    country: Optional[str] = None,
+    q: Optional[str] = None,
+):
+    etag: str = build_etag(request)
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
+
+    stmt: Select = filter_stations(
+        select(
+            Station.id, Station.name, Station.genre, Station.url,
+            Station.slug, Station.country_code, Station.is_favorite,
+        ),
+        q, genre, country,
+    )
+    count_result: AsyncResult = await db.execute(select(func.count()).select_from(stmt.subquery()))
+    total_count: int = count_result.scalar_one()
+
+    result: AsyncResult = await db.execute(
+        stmt.order_by(Station.id).offset((page - 1) * per_page).limit(per_page)
+    )
+    stations: List[dict] = [dict(row) for row in result.mappings().all()]
+
+    return ORJSONResponse(
+        {
+            "page": page,
+            "per_page": per_page,
+            "total": total_count,
             "total_pages": (total_count + per_page - 1) // per_page,
+            "stations": stations,
         },
+        headers=cache_headers(etag),
     )
 
 
+@app.get("/api/countries", response_class=ORJSONResponse)
+async def api_countries(request: Request, db: AsyncSession = Depends(get_db)):
+    etag: str = build_etag(request)
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
+
+    result: AsyncResult = await db.execute(select(Country.code, Country.name).order_by(Country.name))
+    countries: List[dict] = [dict(row) for row in result.mappings().all()]
+    return ORJSONResponse(countries, headers=cache_headers(etag))
+
+
+@app.get("/api/genres", response_class=ORJSONResponse)
+async def api_genres(request: Request, db: AsyncSession = Depends(get_db)):
+    etag: str = build_etag(request)
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
+
+    genres: List[str] = await list_genres(db)
+    return ORJSONResponse(genres, headers=cache_headers(etag))
+
+
 @app.post("/station/create", response_model=StationRead)
 async def create_station_endpoint(station: StationCreate, db: AsyncSession = Depends(get_db)):
     result: AsyncResult = await db.execute(select(Station).where(Station.name == station.name))
@@ -104,7 +226,12 @@ async def create_station_endpoint(station: StationCreate, db: AsyncSession = Dep
     if existing:
         raise HTTPException(status_code=404, detail="Station with this name already exists.")
 
-    new_station: Station = await create_station(db, station)  
+    from slugify import slugify
+
+    new_station: Optional[Station] = await create_station(db, station, slugify(station.name))
+    if new_station is None:
+        raise HTTPException(status_code=409, detail="Station could not be created.")
+    catalog_version.bump(ingest=True)
     return new_station
 
 
@@ -118,6 +245,7 @@ async def toggle_favorite(slug: str, request: Request, db: AsyncSession = Depend
     station.is_favorite = not station.is_favorite
     db.add(station)
     await db.commit()
+    catalog_version.bump()
 
     referer: str = request.headers.get("referer") or "/"
     return RedirectResponse(url=referer, status_code=status.HTTP_303_SEE_OTHER)
@@ -125,6 +253,10 @@ async def toggle_favorite(slug: str, request: Request, db: AsyncSession = Depend
 
 @app.get("/favorites", response_class=HTMLResponse)
 async def favorites(request: Request, db: AsyncSession = Depends(get_db)):
+    etag: str = build_etag(request)
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
+
     result: AsyncResult = await db.execute(select(Station).where(Station.is_favorite.is_(True)).order_by(Station.name.asc()))
     stations: List[Station] = result.scalars().all()
 
@@ -134,14 +266,74 @@ async def favorites(request: Request, db: AsyncSession = Depends(get_db)):
     return templates.TemplateResponse(
         "favorites.html",
         {"request": request, "stations": stations, "countries": countries},
+        headers=cache_headers(etag),
     )
 
 
 @app.get("/songs", response_class=HTMLResponse)
-async def songs(request: Request, db: AsyncSession = Depends(get_db)):
-    result: AsyncResult = await db.execute(select(Song).order_by(Song.name))
-    songs: List[Song] = result.scalars().all()
-    return templates.TemplateResponse("songs.html", {"request": request, "songs": songs})
+async def songs(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    after: Optional[str] = None,
+    prefix: Optional[str] = None,
+):
+    songs: List[Song] = await list_songs(db, SONGS_PER_PAGE + 1, after=after, prefix=prefix)
+    next_cursor: Optional[str] = None
+    if len(songs) > SONGS_PER_PAGE:
+        songs = songs[:SONGS_PER_PAGE]
+        next_cursor = songs[-1].name
+
+    return templates.TemplateResponse(
+        "songs.html",
+        {
+            "request": request,
+            "songs": songs,
+            "selected_prefix": prefix,
+            "after": after,
+            "next_cursor": next_cursor,
+        },
+    )
+
+
+@app.post("/songs/import")
+async def import_songs(payload: SongImport, db: AsyncSession = Depends(get_db)):
+    inserted: int = await upsert_songs(db, payload.names, SONGS_IMPORT_BATCH_SIZE)
+    return {"received": len(payload.names), "inserted": inserted}
+
+
+async def export_songs_csv() -> AsyncGenerator[str, None]:
+    buffer: io.StringIO = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["id", "name"])
+    yield buffer.getvalue()
+
+    async with db_instance.session() as db:
+        async for partition in stream_songs(db, SONGS_EXPORT_BATCH_SIZE):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(partition)
+            yield buffer.getvalue()
+
+
+async def export_songs_ndjson() -> AsyncGenerator[bytes, None]:
+    async with db_instance.session() as db:
+        async for partition in stream_songs(db, SONGS_EXPORT_BATCH_SIZE):
+            yield b"".join(orjson.dumps({"id": row.id, "name": row.name}) + b"\n" for row in partition)
+
+
+@app.get("/songs/export")
+async def export_songs(format: str = Query("csv", pattern="^(csv|ndjson)$")):
+    if format == "ndjson":
+        body: AsyncGenerator = export_songs_ndjson()
+        media_type: str = "application/x-ndjson"
+    else:
+        body = export_songs_csv()
+        media_type = "text/csv"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="songs.{format}"'},
+    )
 
 
 @app.post("/songs/{song_id}/delete")
@@ -175,6 +367,8 @@ async def recognize_song(slug: str, db: AsyncSession = Depends(get_db)):
     if not station:
         raise HTTPException(status_code=404, detail="Station not found")
 
+    import requests
+
     stream_url: str = station.url
     headers: dict = {"Icy-MetaData": "1"}
 
@@ -203,3 +397,25 @@ async def recognize_song(slug: str, db: AsyncSession = Depends(get_db)):
 async def add_song(name: str = Query(...), db: AsyncSession = Depends(get_db)):
     song: Song = await create_song(db, name)
     return {"message": f"Song '{song.name}' added to database"}
+
+
+async def profile_startup() -> None:
+    configs.profile_startup = True
+    await startup_event()
+    await db_instance.dispose()
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Music App server.")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Run startup phases, report their timings and exit.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.profile_startup:
+        asyncio.run(profile_startup())
+    else:
+        import uvicorn
+
+        uvicorn.run(app, host=args.host, port=args.port)